@@ -185,7 +185,9 @@ test "HttpServer start/stop without requests" {
     try testing.expect(!srv.started);
 }
 
-fn httpGet(alloc: Allocator, url: []const u8) !struct { status: std.http.Status, body: []u8 } {
+const HttpResponse = struct { status: std.http.Status, body: []u8 };
+
+fn httpGet(alloc: Allocator, url: []const u8) !HttpResponse {
     var client: std.http.Client = .{ .allocator = alloc };
     defer client.deinit();
 
@@ -200,6 +202,26 @@ fn httpGet(alloc: Allocator, url: []const u8) !struct { status: std.http.Status,
     return .{ .status = resp.head.status, .body = body };
 }
 
+/// Poll /api/health until Zap accepts connections. Bounded exponential backoff
+/// (10ms doubling, capped at 320ms, 8 attempts) instead of a fixed startup sleep.
+fn waitForHealth(alloc: Allocator, port: u16) !void {
+    const max_attempts = 8;
+    var url_buf: [64]u8 = undefined;
+    const url = try std.fmt.bufPrint(&url_buf, "http://127.0.0.1:{d}/api/health", .{port});
+    var delay_ms: u64 = 10;
+    var attempt: usize = 1;
+    while (true) : (attempt += 1) {
+        if (httpGet(alloc, url)) |res| {
+            alloc.free(res.body);
+            return;
+        } else |err| {
+            if (attempt >= max_attempts) return err;
+            std.Thread.sleep(delay_ms * std.time.ns_per_ms);
+            delay_ms = @min(delay_ms * 2, 320);
+        }
+    }
+}
+
 test "health endpoint returns 200 JSON" {
     const testing = std.testing;
     const alloc = testing.allocator;
@@ -208,7 +230,7 @@ test "health endpoint returns 200 JSON" {
     defer srv.destroy();
     try srv.start();
     defer srv.stop();
-    std.Thread.sleep(150 * std.time.ns_per_ms);
+    try waitForHealth(alloc, test_port_base + 2);
 
     const res = try httpGet(alloc, "http://127.0.0.1:18922/api/health");
     defer alloc.free(res.body);
@@ -224,7 +246,7 @@ test "unknown route returns 404" {
     defer srv.destroy();
     try srv.start();
     defer srv.stop();
-    std.Thread.sleep(150 * std.time.ns_per_ms);
+    try waitForHealth(alloc, test_port_base + 3);
 
     const res = try httpGet(alloc, "http://127.0.0.1:18923/api/does-not-exist");
     defer alloc.free(res.body);
@@ -240,7 +262,7 @@ test "CORS reflect for localhost origins and reject others" {
     defer srv.destroy();
     try srv.start();
     defer srv.stop();
-    std.Thread.sleep(150 * std.time.ns_per_ms);
+    try waitForHealth(alloc, test_port_base + 4);
 
     var client: std.http.Client = .{ .allocator = alloc };
     defer client.deinit();
@@ -302,7 +324,7 @@ test "OPTIONS preflight returns 204 with CORS headers" {
     defer srv.destroy();
     try srv.start();
     defer srv.stop();
-    std.Thread.sleep(150 * std.time.ns_per_ms);
+    try waitForHealth(alloc, test_port_base + 5);
     var client: std.http.Client = .{ .allocator = alloc };
     defer client.deinit();
     const url = try std.Uri.parse("http://127.0.0.1:18925/api/health");
@@ -81,6 +81,10 @@ pub const Sqlite = struct {
     alloc: Allocator,
     db: ?*c.sqlite3 = null,
 
+    /// Upper bound SQLite's busy handler spends retrying (with its own backoff) on
+    /// SQLITE_BUSY, e.g. while another connection holds the migration lock.
+    const busy_timeout_ms: c_int = 5000;
+
     pub fn init(alloc: Allocator) Self {
         return .{ .alloc = alloc, .db = null };
     }
@@ -97,6 +101,8 @@ pub const Sqlite = struct {
             return error.OpenFailed;
         }
         self.db = out;
+        // Lock contention is transient: retry inside SQLite instead of failing open().
+        if (c.sqlite3_busy_timeout(out, busy_timeout_ms) != c.SQLITE_OK) log.warn("sqlite busy_timeout not set", .{});
         // Enable WAL and pragmatic defaults. Foreign keys must be enabled explicitly.
         try self.exec("PRAGMA journal_mode=WAL;");
         try self.exec("PRAGMA synchronous=NORMAL;");
@@ -302,31 +308,21 @@ pub const Sqlite = struct {
         return .{ .arena = arena, .columns = columns, .rows = try rows.toOwnedSlice(a) };
     }
 
-    fn ensureSchema(self: *Self) Error!void {
-        // user_version=0 -> apply migration 1
-        var has = try self.query(self.alloc, "PRAGMA user_version;");
-        defer has.deinit();
-        var ver: usize = 0;
-        if (has.rows.len > 0 and has.rows[0].values.len > 0) {
-            // Column 0 is integer user_version
-            const v0 = has.rows[0].values[0];
-            switch (v0) {
-                .integer => |iv| ver = @intCast(iv),
-                .text => |s| ver = std.fmt.parseInt(usize, s, 10) catch 0,
-                else => ver = 0,
-            }
-        }
-        if (ver == 0) {
-            // UUID-text primary keys per plan; thread_id for session; turn_id for messages.
-            try self.exec("CREATE TABLE IF NOT EXISTS sessions (\n" ++
+    /// Ordered schema migrations: migrations[i] upgrades user_version i -> i + 1.
+    /// Each script gets its version bump appended at comptime, so DDL and bump run
+    /// in one exec and cannot drift apart. Malformed entries fail the build.
+    const migrations = blk: {
+        const steps = [_][]const u8{
+            // 1: UUID-text primary keys per plan; thread_id for session; turn_id for messages.
+            "CREATE TABLE IF NOT EXISTS sessions (\n" ++
                 "  id TEXT PRIMARY KEY,\n" ++
                 "  thread_id TEXT,\n" ++
                 "  title TEXT,\n" ++
                 "  workspace_path TEXT,\n" ++
                 "  created_at INTEGER NOT NULL,\n" ++
                 "  updated_at INTEGER NOT NULL\n" ++
-                ");");
-            try self.exec("CREATE TABLE IF NOT EXISTS messages (\n" ++
+                ");\n" ++
+                "CREATE TABLE IF NOT EXISTS messages (\n" ++
                 "  id TEXT PRIMARY KEY,\n" ++
                 "  session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,\n" ++
                 "  turn_id TEXT,\n" ++
@@ -335,13 +331,59 @@ pub const Sqlite = struct {
                 "  content TEXT NOT NULL,\n" ++
                 "  metadata_json TEXT,\n" ++
                 "  timestamp INTEGER NOT NULL\n" ++
-                ");");
-            // Performance-critical indexes
-            try self.exec("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id);");
-            try self.exec("CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);");
-            try self.exec("CREATE INDEX IF NOT EXISTS idx_sessions_workspace ON sessions(workspace_path);");
-            try self.exec("PRAGMA user_version=1;");
+                ");\n" ++
+                // Performance-critical indexes
+                "CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id);\n" ++
+                "CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);\n" ++
+                "CREATE INDEX IF NOT EXISTS idx_sessions_workspace ON sessions(workspace_path);\n",
+        };
+        @setEvalBranchQuota(100_000);
+        var out: [steps.len][]const u8 = undefined;
+        for (steps, 0..) |sql, i| {
+            // Validate at compile time: the appended bump must start a fresh statement,
+            // and versions are owned by this table, not by the scripts.
+            var end = sql.len;
+            while (end > 0 and std.ascii.isWhitespace(sql[end - 1])) end -= 1;
+            if (end == 0 or sql[end - 1] != ';')
+                @compileError(std.fmt.comptimePrint("migration {d} must be non-empty and end with ';'", .{i + 1}));
+            if (std.mem.indexOf(u8, sql, "user_version") != null)
+                @compileError(std.fmt.comptimePrint("migration {d} must not set user_version", .{i + 1}));
+            out[i] = sql ++ std.fmt.comptimePrint("PRAGMA user_version={d};", .{i + 1});
+        }
+        const final = out;
+        break :blk final;
+    };
+
+    /// Schema version produced by ensureSchema (PRAGMA user_version).
+    const latest_schema_version: usize = migrations.len;
+
+    fn userVersion(self: *Self) Error!usize {
+        var has = try self.query(self.alloc, "PRAGMA user_version;");
+        defer has.deinit();
+        if (has.rows.len == 0 or has.rows[0].values.len == 0) return 0;
+        // Column 0 is integer user_version
+        return switch (has.rows[0].values[0]) {
+            .integer => |iv| @intCast(iv),
+            .text => |s| std.fmt.parseInt(usize, s, 10) catch 0,
+            else => 0,
+        };
+    }
+
+    fn ensureSchema(self: *Self) Error!void {
+        // Fast path for the common no-op open: an up-to-date database never takes
+        // the write lock, so it cannot stall behind another connection's writer.
+        if (try self.userVersion() >= latest_schema_version) return;
+        // BEGIN IMMEDIATE takes the write lock before re-reading user_version, so
+        // concurrent openers serialize here and later ones see the applied
+        // version instead of re-running DDL.
+        try self.exec("BEGIN IMMEDIATE;");
+        errdefer self.exec("ROLLBACK;") catch |e| log.warn("schema rollback failed: {}", .{e});
+        // Apply only the pending tail; one sqlite3_exec per migration.
+        const ver = try self.userVersion();
+        if (ver < migrations.len) {
+            for (migrations[ver..]) |sql| try self.exec(sql);
         }
+        try self.exec("COMMIT;");
     }
 };
 
@@ -424,11 +466,69 @@ test "sqlite pragmas wal+fk enabled and migration idempotent" {
         else => return error.Unexpected,
     }
 
+    var busy = try s.query(t.allocator, "PRAGMA busy_timeout;");
+    defer busy.deinit();
+    switch (busy.rows[0].values[0]) {
+        .integer => |iv| try t.expectEqual(@as(i64, Sqlite.busy_timeout_ms), iv),
+        .text => |sval| try t.expectEqual(@as(i64, Sqlite.busy_timeout_ms), try std.fmt.parseInt(i64, sval, 10)),
+        else => return error.Unexpected,
+    }
+
     // Ensure re-running ensureSchema path is idempotent
     try s.exec("PRAGMA user_version=0;");
     try s.ensureSchema();
 }
 
+test "schema migration commits and is skipped by later connections" {
+    const t = std.testing;
+    var tmp = std.testing.tmpDir(.{});
+    defer tmp.cleanup();
+    const p = try tmp.dir.realpathAlloc(t.allocator, ".");
+    defer t.allocator.free(p);
+    const dbfile = try std.fs.path.join(t.allocator, &.{ p, "shared.db" });
+    defer t.allocator.free(dbfile);
+
+    var first = Sqlite.init(t.allocator);
+    try first.open(dbfile);
+    defer _ = first.close() catch {};
+    var second = Sqlite.init(t.allocator);
+    try second.open(dbfile);
+    defer _ = second.close() catch {};
+
+    // ensureSchema must not leave its transaction open; BEGIN would fail otherwise.
+    try first.exec("BEGIN; COMMIT;");
+    try second.exec("BEGIN; COMMIT;");
+
+    var ver = try second.query(t.allocator, "PRAGMA user_version;");
+    defer ver.deinit();
+    switch (ver.rows[0].values[0]) {
+        .integer => |iv| try t.expectEqual(@as(i64, Sqlite.latest_schema_version), iv),
+        .text => |sval| try t.expectEqual(Sqlite.latest_schema_version, try std.fmt.parseInt(usize, sval, 10)),
+        else => return error.Unexpected,
+    }
+}
+
+test "open of migrated database does not wait on an active writer" {
+    const t = std.testing;
+    var tmp = std.testing.tmpDir(.{});
+    defer tmp.cleanup();
+    const p = try tmp.dir.realpathAlloc(t.allocator, ".");
+    defer t.allocator.free(p);
+    const dbfile = try std.fs.path.join(t.allocator, &.{ p, "busy.db" });
+    defer t.allocator.free(dbfile);
+
+    var writer = Sqlite.init(t.allocator);
+    try writer.open(dbfile);
+    defer _ = writer.close() catch {};
+    try writer.exec("BEGIN IMMEDIATE;");
+    defer writer.exec("ROLLBACK;") catch {};
+
+    // Schema is current, so ensureSchema must not request the write lock.
+    var reader = Sqlite.init(t.allocator);
+    try reader.open(dbfile);
+    defer _ = reader.close() catch {};
+}
+
 test "sqlite binds and fk enforcement" {
     const t = std.testing;
     var tmp = std.testing.tmpDir(.{});